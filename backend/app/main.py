@@ -15,9 +15,17 @@ from app.models import (
     VideoAnalysisResponse,
     HealthResponse,
     VideoMetadata,
+    LLMConcurrencyMetrics,
 )
+from app.utils.caption_store import CaptionStore
 from app.utils.youtube_extractor import YouTubeExtractor
 from app.services.ai_analyzer import AIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+)
 
 # Load environment variables
 load_dotenv()
@@ -43,10 +51,28 @@ app.add_middleware(
 # Configuration
 LM_STUDIO_URL = os.getenv("LM_STUDIO_URL", "http://localhost:1234")
 LM_STUDIO_MODEL = os.getenv("LM_STUDIO_MODEL", "smollm-360m-instruct-v0.2")
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "120"))
+FAST_MODE_SLA_SECONDS = float(os.getenv("FAST_MODE_SLA_SECONDS", "15"))
+FAST_MODE_PREVIEW_SECONDS = float(os.getenv("FAST_MODE_PREVIEW_SECONDS", "300"))
+FAST_MODE_MAX_TOKENS = int(os.getenv("FAST_MODE_MAX_TOKENS", "256"))
+ANALYSIS_WAIT_SECONDS = float(os.getenv("ANALYSIS_WAIT_SECONDS", "60"))
+FULL_ANALYSIS_FAILED_MESSAGE = "Full analysis failed. Showing the preview summary."
 
 # Initialize services
 extractor = YouTubeExtractor()
-ai_analyzer = AIAnalyzer(LM_STUDIO_URL, LM_STUDIO_MODEL)
+llm_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=LLM_INITIAL_CONCURRENCY,
+    max_limit=LLM_MAX_CONCURRENCY,
+)
+ai_analyzer = AIAnalyzer(
+    LM_STUDIO_URL,
+    LM_STUDIO_MODEL,
+    limiter=llm_limiter,
+    queue_timeout=LLM_QUEUE_TIMEOUT,
+)
+analysis_cache = AnalysisCache()
 
 
 @app.get("/", tags=["Root"])
@@ -71,8 +97,14 @@ def health_check():
     )
 
 
+@app.get("/api/metrics/llm", response_model=LLMConcurrencyMetrics, tags=["Monitoring"])
+def llm_metrics():
+    """LM Studio concurrency limit, queue depth and latency statistics"""
+    return LLMConcurrencyMetrics(**llm_limiter.snapshot())
+
+
 @app.post("/api/analyze", response_model=VideoAnalysisResponse, tags=["Analysis"])
-def analyze_video(request: VideoRequest):
+def analyze_video(request: VideoRequest, background_tasks: BackgroundTasks):
     """
     Analyze a YouTube video
     
@@ -83,11 +115,16 @@ def analyze_video(request: VideoRequest):
     4. Extracts key points
     5. Creates timestamped analysis segments
     
+    In fast mode only a preview summary is generated from the description
+    and opening captions; the full analysis runs in the background and
+    replaces the preview in the result cache when done.
+    
     Args:
         request: VideoRequest containing YouTube URL
+        background_tasks: FastAPI background task queue
         
     Returns:
-        VideoAnalysisResponse with complete analysis
+        VideoAnalysisResponse with complete analysis or a preview
     """
     start_time = time.time()
     
@@ -109,6 +146,16 @@ def analyze_video(request: VideoRequest):
                 detail="Failed to extract video information. Please check the URL and try again."
             )
 
+        video_id = video_info.get("video_id")
+
+        # A fast-mode request for a video that is already cached (final, or a
+        # preview whose full analysis is still running) is served directly;
+        # a failed earlier run is retried
+        if request.fast_mode and video_id:
+            cached = analysis_cache.get(video_id)
+            if cached is not None and cached.success:
+                return cached
+
         # Create metadata object
         metadata = VideoMetadata(
             title=video_info.get("title", "Unknown"),
@@ -137,42 +184,242 @@ def analyze_video(request: VideoRequest):
                 detail="LM Studio service is not available. Please ensure LM Studio is running."
             )
 
+        if request.fast_mode:
+            preview = _run_preview_analysis(video_id, metadata, captions, start_time)
+            # Only one full analysis runs per video; without an ID there is
+            # nowhere to publish the result, so none is started
+            if video_id:
+                analysis_cache.put(video_id, preview)
+                if analysis_cache.start_run(video_id, PRIORITY_BATCH):
+                    background_tasks.add_task(
+                        _complete_analysis_in_background,
+                        video_id,
+                        metadata,
+                        captions,
+                    )
+            return preview
+
+        # Join a full analysis another request is already running for this
+        # video rather than starting a duplicate; joining promotes it to
+        # interactive priority
+        if video_id and not analysis_cache.start_run(video_id):
+            print("Waiting for in-progress analysis...")
+            analysis_cache.wait_for_run(
+                video_id,
+                timeout=ANALYSIS_WAIT_SECONDS,
+                priority=PRIORITY_INTERACTIVE,
+            )
+            cached = analysis_cache.get(video_id)
+            if cached is not None and cached.success and not cached.is_preview:
+                return cached
+            # The awaited run failed or is still going; only run it here if
+            # this request can claim it
+            if not analysis_cache.start_run(video_id):
+                if cached is not None:
+                    return cached
+                raise HTTPException(
+                    status_code=503,
+                    detail="Analysis for this video is still in progress. Please try again shortly."
+                )
+
+        try:
+            result = _run_full_analysis(video_id, metadata, captions, start_time)
+        finally:
+            if video_id:
+                analysis_cache.finish_run(video_id)
+
+        return result.model_copy(update={"captions": captions.to_segments()})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error analyzing video: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error analyzing video: {str(e)}"
+        )
+
+
+@app.get("/api/analysis/{video_id}", response_model=VideoAnalysisResponse, tags=["Analysis"])
+def get_analysis(video_id: str):
+    """
+    Get the cached analysis for a video
+    
+    Returns the fast-mode preview until the background analysis finishes,
+    then the final result. Check `is_preview` to tell them apart.
+    
+    Args:
+        video_id: YouTube video ID
+        
+    Returns:
+        Cached VideoAnalysisResponse
+    """
+    cached = analysis_cache.get(video_id)
+    if cached is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No analysis found for this video."
+        )
+    return cached
+
+
+def _run_preview_analysis(
+    video_id: Optional[str],
+    metadata: VideoMetadata,
+    captions: CaptionStore,
+    start_time: float,
+) -> VideoAnalysisResponse:
+    """
+    Build a fast-mode preview from the description and opening captions
+    
+    Args:
+        video_id: YouTube video ID
+        metadata: Video metadata
+        captions: Caption track
+        start_time: Request start time, used to budget the latency SLA
+        
+    Returns:
+        VideoAnalysisResponse marked as preview, with success=False if no
+        summary could be produced
+    """
+    # Spend whatever is left of the SLA on the LLM call
+    remaining = max(1.0, FAST_MODE_SLA_SECONDS - (time.time() - start_time))
+
+    print("Generating preview summary...")
+    summary = ai_analyzer.generate_preview_summary(
+        metadata.description,
+        captions,
+        metadata.title,
+        preview_seconds=FAST_MODE_PREVIEW_SECONDS,
+        max_tokens=FAST_MODE_MAX_TOKENS,
+        timeout=remaining,
+    )
+    if not summary and metadata.description:
+        summary = metadata.description[:500]
+
+    processing_time = time.time() - start_time
+
+    # An empty preview is reported as unsuccessful so later fast-mode
+    # requests generate a new one instead of serving it from the cache
+    if summary:
+        message = "Preview generated. Full analysis is running in the background."
+    else:
+        message = "Preview could not be generated. Full analysis is running in the background."
+
+    return VideoAnalysisResponse(
+        success=bool(summary),
+        message=message,
+        video_id=video_id,
+        is_preview=True,
+        metadata=metadata,
+        summary=summary,
+        total_segments=len(captions),
+        processing_time=round(processing_time, 2),
+    )
+
+
+def _run_full_analysis(
+    video_id: Optional[str],
+    metadata: VideoMetadata,
+    captions: CaptionStore,
+    start_time: float,
+    priority: str = PRIORITY_INTERACTIVE,
+) -> VideoAnalysisResponse:
+    """
+    Run all LLM stages and cache the final result
+    
+    The priority is re-read from the analysis cache before each stage, so a
+    batch run that an interactive request joins is promoted from then on.
+    
+    The result is only cached when the summary step succeeded; otherwise a
+    cached preview for the video is marked as failed. Captions stay in the
+    compact CaptionStore in the cache and are left off the returned result,
+    to be converted to CaptionSegment objects only by the caller that sends
+    them.
+    
+    Args:
+        video_id: YouTube video ID
+        metadata: Video metadata
+        captions: Caption track
+        start_time: Analysis start time
+        priority: Scheduling priority when the run is not tracked in the cache
+        
+    Returns:
+        Final VideoAnalysisResponse without captions
+    """
+    try:
         # Generate AI analysis
         print("Generating summary...")
-        summary = ai_analyzer.generate_summary(captions, metadata.title)
+        summary = ai_analyzer.generate_summary(
+            captions,
+            metadata.title,
+            priority=analysis_cache.run_priority(video_id, priority),
+        )
         
         print("Extracting key points...")
-        key_points = ai_analyzer.extract_key_points(captions, metadata.title)
+        key_points = ai_analyzer.extract_key_points(
+            captions,
+            metadata.title,
+            priority=analysis_cache.run_priority(video_id, priority),
+        )
         
         print("Generating timestamped analysis...")
         timestamped_analysis = ai_analyzer.generate_timestamped_analysis(
             captions,
             metadata.title,
-            num_segments=5
+            num_segments=5,
+            priority=analysis_cache.run_priority(video_id, priority),
         )
+    except Exception:
+        if video_id:
+            analysis_cache.fail_preview(video_id, FULL_ANALYSIS_FAILED_MESSAGE)
+        raise
 
-        processing_time = time.time() - start_time
-
-        return VideoAnalysisResponse(
-            success=True,
-            message="Video analysis completed successfully",
-            metadata=metadata,
-            summary=summary,
-            key_points=key_points,
-            timestamped_analysis=timestamped_analysis,
-            captions=captions,
-            total_segments=len(captions),
-            processing_time=round(processing_time, 2),
-        )
+    processing_time = time.time() - start_time
 
-    except HTTPException:
-        raise
+    result = VideoAnalysisResponse(
+        success=True,
+        message="Video analysis completed successfully",
+        video_id=video_id,
+        is_preview=False,
+        metadata=metadata,
+        summary=summary,
+        key_points=key_points,
+        timestamped_analysis=timestamped_analysis,
+        total_segments=len(captions),
+        processing_time=round(processing_time, 2),
+    )
+
+    if video_id:
+        if summary:
+            analysis_cache.put(video_id, result, captions)
+        else:
+            analysis_cache.fail_preview(video_id, FULL_ANALYSIS_FAILED_MESSAGE)
+
+    return result
+
+
+def _complete_analysis_in_background(
+    video_id: str,
+    metadata: VideoMetadata,
+    captions: CaptionStore,
+) -> None:
+    """
+    Run the full analysis at batch priority after a preview was returned
+    
+    The caller must have claimed the run with analysis_cache.start_run.
+    
+    Args:
+        video_id: YouTube video ID
+        metadata: Video metadata
+        captions: Caption track
+    """
+    try:
+        _run_full_analysis(video_id, metadata, captions, time.time(), PRIORITY_BATCH)
     except Exception as e:
-        print(f"Error analyzing video: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error analyzing video: {str(e)}"
-        )
+        print(f"Error completing background analysis: {str(e)}")
+    finally:
+        analysis_cache.finish_run(video_id)
 
 
 def _is_valid_youtube_url(url: str) -> bool:
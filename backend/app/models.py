@@ -8,6 +8,10 @@ from pydantic import BaseModel, Field, HttpUrl
 class VideoRequest(BaseModel):
     """Request model for video analysis"""
     url: str = Field(..., description="YouTube video URL")
+    fast_mode: bool = Field(
+        default=False,
+        description="Return a quick preview summary and finish the full analysis in the background",
+    )
 
 
 class CaptionSegment(BaseModel):
@@ -47,6 +51,8 @@ class VideoAnalysisResponse(BaseModel):
     """Complete response for video analysis"""
     success: bool = Field(..., description="Whether analysis was successful")
     message: str = Field(..., description="Response message")
+    video_id: Optional[str] = Field(None, description="YouTube video ID, used to fetch the cached result")
+    is_preview: bool = Field(default=False, description="Whether this is a fast-mode preview rather than the final analysis")
     metadata: Optional[VideoMetadata] = Field(None, description="Video metadata")
     summary: Optional[str] = Field(None, description="AI-generated summary")
     key_points: Optional[List[KeyPoint]] = Field(None, description="Extracted key points")
@@ -61,3 +67,23 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Health status")
     version: str = Field(..., description="API version")
     lm_studio_available: bool = Field(..., description="LM Studio availability")
+
+
+class LLMConcurrencyMetrics(BaseModel):
+    """LM Studio concurrency limiter state"""
+    limit: int = Field(..., description="Current number of requests allowed in flight")
+    min_limit: int = Field(..., description="Lower bound for the concurrency limit")
+    max_limit: int = Field(..., description="Upper bound for the concurrency limit")
+    in_flight: int = Field(..., description="Requests currently being processed by LM Studio")
+    queue_depth: int = Field(..., description="Requests waiting for a free slot")
+    queue_depth_interactive: int = Field(..., description="Interactive requests waiting for a free slot")
+    queue_depth_batch: int = Field(..., description="Batch requests waiting for a free slot")
+    baseline_ttft_per_1k_tokens: Optional[float] = Field(None, description="Best observed time to first token in seconds per 1k prompt tokens")
+    last_ttft_per_1k_tokens: Optional[float] = Field(None, description="Most recent time to first token in seconds per 1k prompt tokens")
+    last_ttft: Optional[float] = Field(None, description="Most recent time to first token in seconds")
+    baseline_tokens_per_sec: Optional[float] = Field(None, description="Best observed generation throughput")
+    last_tokens_per_sec: Optional[float] = Field(None, description="Most recent generation throughput")
+    completed: int = Field(..., description="Requests completed successfully")
+    failed: int = Field(..., description="Requests that failed")
+    rejected: int = Field(..., description="Requests that timed out waiting in the queue")
+    cancelled: int = Field(..., description="Requests cut off by the caller's deadline")
@@ -2,30 +2,45 @@
 AI analysis service using LM Studio
 """
 import re
+import json
 import time
 from typing import Optional, List, Dict
 import requests
 from app.models import (
     KeyPoint,
     TimestampedAnalysis,
-    CaptionSegment,
+)
+from app.utils.caption_store import CaptionStore
+from app.services.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    PRIORITY_INTERACTIVE,
 )
 
 
 class AIAnalyzer:
     """Service for AI-powered analysis using LM Studio"""
 
-    def __init__(self, lm_studio_url: str, model_name: str):
+    def __init__(
+        self,
+        lm_studio_url: str,
+        model_name: str,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        queue_timeout: Optional[float] = 120,
+    ):
         """
         Initialize AI Analyzer
         
         Args:
             lm_studio_url: Base URL for LM Studio (e.g., http://localhost:1234)
             model_name: Model name to use for analysis
+            limiter: Concurrency limiter shared by all LM Studio requests
+            queue_timeout: Maximum seconds a request waits for a free slot
         """
         self.lm_studio_url = lm_studio_url.rstrip("/")
         self.model_name = model_name
         self.api_endpoint = f"{self.lm_studio_url}/v1/chat/completions"
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.queue_timeout = queue_timeout
 
     def is_available(self) -> bool:
         """Check if LM Studio is available"""
@@ -39,13 +54,19 @@ class AIAnalyzer:
             print(f"LM Studio availability check failed: {str(e)}")
             return False
 
-    def generate_summary(self, captions: List[CaptionSegment], title: str = "") -> Optional[str]:
+    def generate_summary(
+        self,
+        captions: CaptionStore,
+        title: str = "",
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> Optional[str]:
         """
         Generate summary from video captions
         
         Args:
-            captions: List of caption segments
+            captions: Caption track
             title: Video title for context
+            priority: Scheduling priority for the LM Studio request
             
         Returns:
             Generated summary or None if generation fails
@@ -53,12 +74,8 @@ class AIAnalyzer:
         if not captions:
             return None
 
-        # Combine captions
-        full_text = " ".join([seg.text for seg in captions])
-        
-        # Truncate if too long to avoid token limits
-        if len(full_text) > 8000:
-            full_text = full_text[:8000] + "..."
+        # Combine captions, truncated to avoid token limits
+        full_text = captions.text(max_chars=8000)
 
         prompt = f"""You are a professional video content analyst. Generate a comprehensive summary of the following video content.
 
@@ -75,15 +92,66 @@ Provide a clear, well-structured summary that:
 
 Summary:"""
 
-        return self._send_request(prompt)
+        return self._send_request(prompt, priority=priority)
+
+    def generate_preview_summary(
+        self,
+        description: str,
+        captions: CaptionStore,
+        title: str = "",
+        preview_seconds: float = 300,
+        max_tokens: int = 256,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Generate a quick gist from the video description and opening captions
+        
+        Args:
+            description: Video description from metadata
+            captions: Caption track
+            title: Video title for context
+            preview_seconds: Only captions starting before this time are used
+            max_tokens: Upper bound on generated tokens
+            timeout: Maximum seconds to wait for a slot and for LM Studio
+            
+        Returns:
+            Generated preview summary or None if generation fails
+        """
+        if not description and not captions:
+            return None
+
+        description = (description or "")[:1500]
+        opening_text = captions.text(end_time=preview_seconds, max_chars=3000)
+
+        prompt = f"""You are a professional video content analyst. Give a short gist of this video based on its description and opening.
+
+Video Title: {title}
+
+Description:
+{description}
+
+Opening:
+{opening_text}
+
+Write 3-4 sentences describing what the video is about.
+
+Gist:"""
+
+        return self._send_request(prompt, max_tokens=max_tokens, timeout=timeout)
 
-    def extract_key_points(self, captions: List[CaptionSegment], title: str = "") -> List[KeyPoint]:
+    def extract_key_points(
+        self,
+        captions: CaptionStore,
+        title: str = "",
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> List[KeyPoint]:
         """
         Extract key points from video captions
         
         Args:
-            captions: List of caption segments
+            captions: Caption track
             title: Video title for context
+            priority: Scheduling priority for the LM Studio request
             
         Returns:
             List of KeyPoint objects
@@ -91,10 +159,7 @@ Summary:"""
         if not captions:
             return []
 
-        full_text = " ".join([seg.text for seg in captions])
-        
-        if len(full_text) > 6000:
-            full_text = full_text[:6000] + "..."
+        full_text = captions.text(max_chars=6000)
 
         prompt = f"""You are a professional video content analyst. Extract the key points from the following video content.
 
@@ -107,7 +172,7 @@ Extract 5-8 important key points. Format each point on a new line starting with
 
 Key Points:"""
 
-        response = self._send_request(prompt)
+        response = self._send_request(prompt, priority=priority)
         if not response:
             return []
 
@@ -126,17 +191,19 @@ Key Points:"""
 
     def generate_timestamped_analysis(
         self, 
-        captions: List[CaptionSegment],
+        captions: CaptionStore,
         title: str = "",
-        num_segments: int = 5
+        num_segments: int = 5,
+        priority: str = PRIORITY_INTERACTIVE,
     ) -> List[TimestampedAnalysis]:
         """
         Generate timestamped analysis by dividing video into segments
         
         Args:
-            captions: List of caption segments
+            captions: Caption track
             title: Video title
             num_segments: Number of segments to divide analysis into
+            priority: Scheduling priority for the LM Studio requests
             
         Returns:
             List of TimestampedAnalysis objects
@@ -145,7 +212,7 @@ Key Points:"""
             return []
 
         # Calculate total duration and segment boundaries
-        total_duration = captions[-1].timestamp if captions else 0
+        total_duration = captions.last_timestamp
         if total_duration == 0:
             return []
 
@@ -156,21 +223,12 @@ Key Points:"""
             start_time = seg_idx * segment_duration
             end_time = (seg_idx + 1) * segment_duration
 
-            # Get captions for this segment
-            segment_captions = [
-                cap for cap in captions
-                if start_time <= cap.timestamp < end_time
-            ]
+            # Get captions for this segment, limiting text length
+            segment_text = captions.text(start_time, end_time, max_chars=2000)
 
-            if not segment_captions:
+            if not segment_text:
                 continue
 
-            segment_text = " ".join([cap.text for cap in segment_captions])
-            
-            # Limit text length
-            if len(segment_text) > 2000:
-                segment_text = segment_text[:2000] + "..."
-
             prompt = f"""You are a professional video content analyst. Analyze this segment of video content and provide a brief summary with key insights.
 
 Video Title: {title}
@@ -187,7 +245,7 @@ Format:
 Summary: [your summary]
 Insights: [bullet point list]"""
 
-            response = self._send_request(prompt)
+            response = self._send_request(prompt, priority=priority)
             
             if response:
                 # Parse response
@@ -222,16 +280,47 @@ Insights: [bullet point list]"""
 
         return segments_analysis
 
-    def _send_request(self, prompt: str) -> Optional[str]:
+    def _send_request(
+        self,
+        prompt: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        max_tokens: int = 1000,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
         """
         Send request to LM Studio API
         
+        The request is admitted through the adaptive concurrency limiter and
+        streamed so that time-to-first-token and tokens/sec can be measured
+        and fed back into the limiter.
+        
         Args:
             prompt: The prompt to send
+            priority: Scheduling priority (interactive or batch)
+            max_tokens: Upper bound on generated tokens
+            timeout: Wall-clock budget in seconds covering the queue wait and
+                the whole response; once it passes, streaming stops and the
+                text received so far is returned. Defaults to the configured
+                queue timeout plus a 60 second read timeout.
             
         Returns:
             Generated response or None if request fails
         """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        queue_timeout = self.queue_timeout if timeout is None else timeout
+        if not self.limiter.acquire(priority, timeout=queue_timeout):
+            print("LM Studio request queue timed out")
+            return None
+
+        start = time.monotonic()
+        read_timeout = 60 if deadline is None else max(0.1, deadline - start)
+        first_token_at = None
+        token_count = 0
+        success = False
+        cut_off = False
+        # Rough estimate until LM Studio reports the real count
+        prompt_tokens = len(prompt) // 4
+
         try:
             payload = {
                 "model": self.model_name,
@@ -242,27 +331,68 @@ Insights: [bullet point list]"""
                     }
                 ],
                 "temperature": 0.7,
-                "max_tokens": 1000,
-                "top_p": 0.9
+                "max_tokens": max_tokens,
+                "top_p": 0.9,
+                "stream": True,
             }
 
             response = requests.post(
                 self.api_endpoint,
                 json=payload,
-                timeout=60
+                timeout=read_timeout,
+                stream=True
             )
 
-            if response.status_code != 200:
-                print(f"API error: {response.status_code} - {response.text}")
+            with response:
+                if response.status_code != 200:
+                    print(f"API error: {response.status_code} - {response.text}")
+                    return None
+
+                chunks = []
+                try:
+                    for line in response.iter_lines(decode_unicode=True):
+                        # The read timeout only bounds each read, so enforce the
+                        # overall budget here and keep what has arrived so far
+                        if deadline is not None and time.monotonic() >= deadline:
+                            print("LM Studio response cut off at deadline")
+                            cut_off = True
+                            break
+
+                        if not line or not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+
+                        chunk = json.loads(data)
+                        usage = chunk.get("usage")
+                        if usage and usage.get("completion_tokens"):
+                            token_count = usage["completion_tokens"]
+                        if usage and usage.get("prompt_tokens"):
+                            prompt_tokens = usage["prompt_tokens"]
+
+                        choices = chunk.get("choices") or []
+                        if not choices:
+                            continue
+                        content = (choices[0].get("delta") or {}).get("content")
+                        if content:
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
+                            chunks.append(content)
+                            if not usage:
+                                token_count += 1
+                except requests.RequestException:
+                    # A read that outlives the deadline ends the response early
+                    if deadline is None or time.monotonic() < deadline:
+                        raise
+                    print("LM Studio response cut off at deadline")
+                    cut_off = True
+
+            if not chunks:
                 return None
 
-            response_data = response.json()
-            
-            # Extract the content from the response
-            if "choices" in response_data and len(response_data["choices"]) > 0:
-                return response_data["choices"][0]["message"]["content"].strip()
-
-            return None
+            success = True
+            return "".join(chunks).strip()
 
         except requests.Timeout:
             print("LM Studio API request timed out")
@@ -273,3 +403,22 @@ Insights: [bullet point list]"""
         except Exception as e:
             print(f"Error in AI analysis: {str(e)}")
             return None
+        finally:
+            ttft = None
+            tokens_per_sec = None
+            if first_token_at is not None:
+                ttft = first_token_at - start
+                generation_time = time.monotonic() - first_token_at
+                if generation_time > 0 and token_count > 1:
+                    tokens_per_sec = token_count / generation_time
+            # Running out of the caller's own budget says nothing about
+            # backend health, so it must not shrink the shared limit
+            if deadline is not None and time.monotonic() >= deadline and not success:
+                cut_off = True
+            self.limiter.release(
+                ttft=ttft,
+                tokens_per_sec=tokens_per_sec,
+                success=success,
+                cancelled=cut_off,
+                prompt_tokens=prompt_tokens,
+            )
@@ -0,0 +1,188 @@
+"""
+In-memory cache of video analysis results
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict
+
+from app.models import VideoAnalysisResponse
+from app.services.concurrency import PRIORITY_INTERACTIVE
+from app.utils.caption_store import CaptionStore
+
+
+class _AnalysisRun:
+    """State of an in-progress full analysis"""
+
+    __slots__ = ("priority", "done")
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.done = threading.Event()
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache of analysis results keyed by video ID
+
+    Captions are kept as a CaptionStore next to the response and only
+    converted to CaptionSegment objects when a result is read. The cache also
+    tracks which videos have a full analysis in progress, and at what
+    priority, so that concurrent requests do not start duplicate runs.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of videos to keep
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[VideoAnalysisResponse, Optional[CaptionStore]]]" = OrderedDict()
+        self._running: Dict[str, _AnalysisRun] = {}
+        self._lock = threading.Lock()
+
+    def get(self, video_id: str) -> Optional[VideoAnalysisResponse]:
+        """
+        Get cached result for a video
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Cached VideoAnalysisResponse (preview or final) or None
+        """
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(video_id)
+
+        result, captions = entry
+        if captions is None:
+            return result
+        return result.model_copy(update={"captions": captions.to_segments()})
+
+    def put(
+        self,
+        video_id: str,
+        result: VideoAnalysisResponse,
+        captions: Optional[CaptionStore] = None,
+    ) -> None:
+        """
+        Store a result for a video
+
+        A preview never replaces a successful final result that is already
+        cached.
+
+        Args:
+            video_id: YouTube video ID
+            result: Analysis result to store, without captions
+            captions: Caption track to attach when the result is read
+        """
+        with self._lock:
+            existing = self._entries.get(video_id)
+            if (
+                result.is_preview
+                and existing is not None
+                and not existing[0].is_preview
+                and existing[0].success
+            ):
+                return
+
+            self._entries[video_id] = (result, captions)
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def fail_preview(self, video_id: str, message: str) -> None:
+        """
+        Mark a cached preview as final after its full analysis failed
+
+        The preview summary is kept, but the entry is no longer a preview
+        and carries success=False so polling clients can stop.
+
+        Args:
+            video_id: YouTube video ID
+            message: Message explaining the failure
+        """
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None or not entry[0].is_preview:
+                return
+
+            result = entry[0].model_copy(
+                update={"success": False, "is_preview": False, "message": message}
+            )
+            self._entries[video_id] = (result, None)
+
+    def start_run(self, video_id: str, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """
+        Claim the full analysis run for a video
+
+        Args:
+            video_id: YouTube video ID
+            priority: Scheduling priority the run starts with
+
+        Returns:
+            True if the caller should run the analysis, False if another run
+            is already in progress
+        """
+        with self._lock:
+            if video_id in self._running:
+                return False
+            self._running[video_id] = _AnalysisRun(priority)
+            return True
+
+    def finish_run(self, video_id: str) -> None:
+        """
+        Release a run claimed with start_run and wake any waiters
+
+        Args:
+            video_id: YouTube video ID
+        """
+        with self._lock:
+            run = self._running.pop(video_id, None)
+        if run is not None:
+            run.done.set()
+
+    def run_priority(self, video_id: Optional[str], default: str) -> str:
+        """
+        Get the current priority of the run for a video
+
+        Args:
+            video_id: YouTube video ID
+            default: Priority to use when no run is tracked
+
+        Returns:
+            Scheduling priority for the run's next LLM stage
+        """
+        with self._lock:
+            run = self._running.get(video_id) if video_id else None
+            return run.priority if run is not None else default
+
+    def wait_for_run(
+        self,
+        video_id: str,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> bool:
+        """
+        Wait for an in-progress run for a video to finish
+
+        Args:
+            video_id: YouTube video ID
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            priority: Priority of the waiting caller; an interactive waiter
+                promotes the run so it is not held back as batch work
+
+        Returns:
+            True if no run is in progress anymore, False if the wait timed out
+        """
+        with self._lock:
+            run = self._running.get(video_id)
+            if run is None:
+                return True
+            if priority == PRIORITY_INTERACTIVE:
+                run.priority = PRIORITY_INTERACTIVE
+        return run.done.wait(timeout)
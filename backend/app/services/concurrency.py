@@ -0,0 +1,234 @@
+"""
+Adaptive concurrency limiter for LM Studio requests
+"""
+import threading
+import time
+from typing import Optional, Dict, Any
+
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter driven by observed LLM latency
+
+    The allowed number of in-flight requests grows additively while
+    time-to-first-token and tokens/sec stay close to their best observed
+    values, and shrinks multiplicatively once the backend starts queueing
+    internally (latency climbs) or requests fail. Interactive callers are
+    always admitted ahead of waiting batch callers.
+
+    Prefill time grows with prompt length, so time-to-first-token is
+    compared per 1k prompt tokens rather than in absolute seconds; otherwise
+    long prompts would read as congestion on an idle backend.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 4,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.75,
+        baseline_drift: float = 0.05,
+        min_prompt_tokens: int = 256,
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            initial_limit: Number of concurrent requests allowed at startup
+            min_limit: Lower bound for the concurrency limit
+            max_limit: Upper bound for the concurrency limit
+            latency_tolerance: How far latency may degrade from its baseline
+                before the backend is considered congested
+            backoff_ratio: Multiplier applied to the limit on congestion
+            baseline_drift: Rate at which baselines follow worse samples, so a
+                stale best-case measurement does not pin the limit down forever
+            min_prompt_tokens: Floor on the prompt size used to normalize
+                time-to-first-token, so the fixed per-request overhead of
+                short prompts does not dominate
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.baseline_drift = baseline_drift
+        self.min_prompt_tokens = max(1, min_prompt_tokens)
+
+        self._cond = threading.Condition()
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiting = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 0}
+
+        self._baseline_ttft_per_1k: Optional[float] = None
+        self._baseline_tps: Optional[float] = None
+        self._last_ttft: Optional[float] = None
+        self._last_ttft_per_1k: Optional[float] = None
+        self._last_tps: Optional[float] = None
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._cancelled = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+
+    def acquire(self, priority: str = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for an in-flight slot
+
+        Args:
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if a slot was acquired, False if the wait timed out
+        """
+        if priority not in self._waiting:
+            priority = PRIORITY_BATCH
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while not self._can_start(priority):
+                    if deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected += 1
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting[priority] -= 1
+                if priority == PRIORITY_INTERACTIVE:
+                    # Batch waiters may have been held back only by this caller
+                    self._cond.notify_all()
+
+            self._in_flight += 1
+            return True
+
+    def release(
+        self,
+        ttft: Optional[float] = None,
+        tokens_per_sec: Optional[float] = None,
+        success: bool = True,
+        cancelled: bool = False,
+        prompt_tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Return a slot and adjust the limit from the request's measurements
+
+        Args:
+            ttft: Observed time to first token in seconds
+            tokens_per_sec: Observed generation throughput
+            success: Whether the request completed successfully
+            cancelled: The caller abandoned the request at its own deadline;
+                the slot is freed without adjusting the limit
+            prompt_tokens: Size of the request's prompt, used to normalize ttft
+        """
+        with self._cond:
+            saturated = self._in_flight >= self.limit
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if cancelled:
+                self._cancelled += 1
+            elif not success:
+                self._failed += 1
+                self._decrease()
+            else:
+                self._completed += 1
+                congested = self._record_sample(ttft, tokens_per_sec, prompt_tokens)
+                if congested:
+                    self._decrease()
+                elif saturated:
+                    # Only probe for more capacity when the current limit was actually used
+                    self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get current limiter state for monitoring
+
+        Returns:
+            Dictionary with limit, queue depth and latency statistics
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "queue_depth": sum(self._waiting.values()),
+                "queue_depth_interactive": self._waiting[PRIORITY_INTERACTIVE],
+                "queue_depth_batch": self._waiting[PRIORITY_BATCH],
+                "baseline_ttft_per_1k_tokens": self._round(self._baseline_ttft_per_1k),
+                "last_ttft_per_1k_tokens": self._round(self._last_ttft_per_1k),
+                "last_ttft": self._round(self._last_ttft),
+                "baseline_tokens_per_sec": self._round(self._baseline_tps),
+                "last_tokens_per_sec": self._round(self._last_tps),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+            }
+
+    def _can_start(self, priority: str) -> bool:
+        """Check whether a caller of the given priority may start now"""
+        if self._in_flight >= self.limit:
+            return False
+        if priority == PRIORITY_BATCH and self._waiting[PRIORITY_INTERACTIVE] > 0:
+            return False
+        return True
+
+    def _decrease(self) -> None:
+        """Multiplicatively shrink the limit"""
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+
+    def _record_sample(
+        self,
+        ttft: Optional[float],
+        tokens_per_sec: Optional[float],
+        prompt_tokens: Optional[int],
+    ) -> bool:
+        """
+        Update baselines with a new sample
+
+        Returns:
+            True if the sample indicates the backend is congested
+        """
+        congested = False
+
+        if ttft is not None and ttft > 0:
+            self._last_ttft = ttft
+            ttft_per_1k = ttft * 1000 / max(prompt_tokens or 0, self.min_prompt_tokens)
+            self._last_ttft_per_1k = ttft_per_1k
+            if self._baseline_ttft_per_1k is None or ttft_per_1k < self._baseline_ttft_per_1k:
+                self._baseline_ttft_per_1k = ttft_per_1k
+            else:
+                if ttft_per_1k > self._baseline_ttft_per_1k * self.latency_tolerance:
+                    congested = True
+                self._baseline_ttft_per_1k += (ttft_per_1k - self._baseline_ttft_per_1k) * self.baseline_drift
+
+        if tokens_per_sec is not None and tokens_per_sec > 0:
+            self._last_tps = tokens_per_sec
+            if self._baseline_tps is None or tokens_per_sec > self._baseline_tps:
+                self._baseline_tps = tokens_per_sec
+            else:
+                if tokens_per_sec < self._baseline_tps / self.latency_tolerance:
+                    congested = True
+                self._baseline_tps += (tokens_per_sec - self._baseline_tps) * self.baseline_drift
+
+        return congested
+
+    @staticmethod
+    def _round(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
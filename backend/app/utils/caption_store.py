@@ -0,0 +1,127 @@
+"""
+Compact in-memory caption storage
+"""
+from array import array
+from bisect import bisect_left
+from typing import Optional, List, Iterable
+
+from app.models import CaptionSegment
+
+
+class CaptionStore:
+    """
+    Immutable array-backed caption track
+
+    Timestamps and durations are kept in typed arrays and all caption text
+    lives in a single string buffer (segments separated by a space) indexed
+    by offsets. Multi-hour tracks therefore cost a few bytes per segment plus
+    the text itself, instead of one Pydantic object per segment.
+    CaptionSegment objects are only created by to_segments() when building
+    an API response.
+
+    A store is built once, by from_parts(), and never modified afterwards,
+    so it can be shared between threads without locking.
+    """
+
+    __slots__ = ("_timestamps", "_durations", "_offsets", "_buffer")
+
+    def __init__(self):
+        """Initialize empty caption store"""
+        self._timestamps = array("d")
+        self._durations = array("d")
+        self._offsets = array("q")
+        self._buffer = ""
+
+    @classmethod
+    def from_parts(
+        cls,
+        timestamps: Iterable[float],
+        texts: List[str],
+        durations: Iterable[float],
+    ) -> "CaptionStore":
+        """
+        Build a store from parallel per-segment sequences
+
+        Args:
+            timestamps: Segment start times in seconds, in ascending order
+            texts: Segment texts
+            durations: Segment durations in seconds
+
+        Returns:
+            CaptionStore holding the segments
+        """
+        store = cls()
+        store._timestamps = array("d", timestamps)
+        store._durations = array("d", durations)
+        if not len(store._timestamps) == len(store._durations) == len(texts):
+            raise ValueError("timestamps, texts and durations must have the same length")
+
+        offset = 0
+        for text in texts:
+            store._offsets.append(offset)
+            offset += len(text) + 1
+        store._buffer = " ".join(texts)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self._timestamps) > 0
+
+    @property
+    def last_timestamp(self) -> float:
+        """Start time of the last caption segment in seconds"""
+        return self._timestamps[-1] if self._timestamps else 0.0
+
+    def text(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ) -> str:
+        """
+        Get the joined text of segments starting in [start_time, end_time)
+
+        Args:
+            start_time: Range start in seconds (inclusive), or None for the beginning
+            end_time: Range end in seconds (exclusive), or None for the end
+            max_chars: Truncate to this many characters, marking the cut with "..."
+
+        Returns:
+            Space-separated caption text, empty if no segments are in range
+        """
+        lo = 0 if start_time is None else bisect_left(self._timestamps, start_time)
+        hi = len(self) if end_time is None else bisect_left(self._timestamps, end_time)
+        if lo >= hi:
+            return ""
+
+        start = self._offsets[lo]
+        end = self._segment_end(hi - 1)
+
+        if max_chars is not None and end - start > max_chars:
+            return self._buffer[start:start + max_chars] + "..."
+        return self._buffer[start:end]
+
+    def to_segments(self) -> List[CaptionSegment]:
+        """
+        Materialize the track as CaptionSegment objects for an API response
+
+        Returns:
+            List of CaptionSegment objects
+        """
+        return [
+            CaptionSegment(
+                timestamp=self._timestamps[i],
+                text=self._buffer[self._offsets[i]:self._segment_end(i)],
+                duration=self._durations[i],
+            )
+            for i in range(len(self))
+        ]
+
+    def _segment_end(self, index: int) -> int:
+        """Buffer offset just past the text of a segment"""
+        if index + 1 < len(self):
+            # Next segment starts after the separating space
+            return self._offsets[index + 1] - 1
+        return len(self._buffer)
@@ -3,9 +3,14 @@ YouTube video extraction utility using yt-dlp
 """
 import re
 import json
+from array import array
 from typing import Optional, List, Dict, Any
 import yt_dlp
-from app.models import CaptionSegment, VideoMetadata
+from app.models import VideoMetadata
+from app.utils.caption_store import CaptionStore
+
+
+VTT_TAG_PATTERN = re.compile(r"<[^>]+>")
 
 
 class YouTubeExtractor:
@@ -50,7 +55,7 @@ class YouTubeExtractor:
             print(f"Error extracting video info: {str(e)}")
             return None
 
-    def extract_captions(self, url: str) -> Optional[List[CaptionSegment]]:
+    def extract_captions(self, url: str) -> Optional[CaptionStore]:
         """
         Extract captions from YouTube video with timestamps
         
@@ -58,7 +63,7 @@ class YouTubeExtractor:
             url: YouTube video URL
             
         Returns:
-            List of CaptionSegment objects or None if extraction fails
+            CaptionStore (empty if no captions were found) or None if extraction fails
         """
         try:
             with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
@@ -81,75 +86,95 @@ class YouTubeExtractor:
                         captions_dict = all_captions[first_lang]
                 
                 if not captions_dict:
-                    return []
+                    return CaptionStore()
                 
                 # Extract VTT format captions
                 caption_data = captions_dict[0] if captions_dict else None
                 if not caption_data:
-                    return []
+                    return CaptionStore()
                 
                 captions_text = caption_data.get("data", "")
                 if not captions_text:
-                    return []
+                    return CaptionStore()
                 
                 return self._parse_vtt_captions(captions_text)
                 
         except Exception as e:
             print(f"Error extracting captions: {str(e)}")
-            return []
+            return CaptionStore()
 
     @staticmethod
-    def _parse_vtt_captions(vtt_content: str) -> List[CaptionSegment]:
+    def _parse_vtt_captions(vtt_content: str) -> CaptionStore:
         """
         Parse VTT caption format
         
+        Lines are read one at a time and the segment texts are packed into a
+        CaptionStore once at the end, so no intermediate line list or
+        per-segment Pydantic objects are built.
+        
         Args:
             vtt_content: VTT formatted caption text
             
         Returns:
-            List of CaptionSegment objects
+            CaptionStore with parsed segments
         """
-        segments = []
-        lines = vtt_content.strip().split("\n")
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        timestamps = array("d")
+        texts = []
+        start_time = None
+        text_parts = []
+
+        def flush():
+            caption_text = " ".join(text_parts).strip()
+            if start_time is not None and caption_text:
+                timestamps.append(start_time)
+                texts.append(caption_text)
+            text_parts.clear()
+
+        for raw_line in YouTubeExtractor._iter_lines(vtt_content):
+            line = raw_line.strip()
             
             # Look for timestamp line
             if "-->" in line:
+                flush()
                 try:
                     # Parse timestamp
                     timestamp_str = line.split("-->")[0].strip()
                     start_time = YouTubeExtractor._convert_timestamp_to_seconds(timestamp_str)
-                    
-                    # Get caption text
-                    caption_text = ""
-                    i += 1
-                    while i < len(lines) and lines[i].strip() and "-->" not in lines[i]:
-                        text = lines[i].strip()
-                        # Remove WebVTT formatting tags
-                        text = re.sub(r"<[^>]+>", "", text)
-                        if text:
-                            caption_text += text + " "
-                        i += 1
-                    
-                    caption_text = caption_text.strip()
-                    if caption_text:
-                        segments.append(
-                            CaptionSegment(
-                                timestamp=start_time,
-                                text=caption_text,
-                                duration=1.0
-                            )
-                        )
-                    continue
                 except Exception as e:
                     print(f"Error parsing caption line: {str(e)}")
-            
-            i += 1
+                    start_time = None
+            elif not line:
+                # Blank line ends the current cue
+                flush()
+                start_time = None
+            elif start_time is not None:
+                # Remove WebVTT formatting tags
+                text = VTT_TAG_PATTERN.sub("", line)
+                if text:
+                    text_parts.append(text)
+
+        flush()
+        return CaptionStore.from_parts(timestamps, texts, array("d", [1.0]) * len(texts))
+
+    @staticmethod
+    def _iter_lines(content: str):
+        """
+        Yield lines of a string one at a time without copying it
         
-        return segments
+        Args:
+            content: Multi-line text
+            
+        Yields:
+            Each line without its trailing newline
+        """
+        pos = 0
+        length = len(content)
+        while pos < length:
+            end = content.find("\n", pos)
+            if end == -1:
+                end = length
+            yield content[pos:end]
+            pos = end + 1
 
     @staticmethod
     def _convert_timestamp_to_seconds(timestamp: str) -> float:
@@ -0,0 +1,108 @@
+"""
+Caption memory benchmark
+
+Loads and parses synthetic auto-caption VTT tracks of increasing length and
+reports peak RSS growth per hour of video, measured from just before the
+track is loaded. Each measurement runs in a fresh interpreter so
+peaks do not carry over between runs.
+
+Usage:
+    python benchmarks/caption_memory.py [--hours 1 2 5 10] [--materialize]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+CUE_SECONDS = 2
+WORDS = ["so", "today", "we", "are", "going", "to", "talk", "about", "the", "video", "and", "this"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def format_timestamp(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.000"
+
+
+def build_vtt(hours: float) -> str:
+    """
+    Build a VTT track shaped like YouTube auto-captions
+
+    Args:
+        hours: Length of the track in hours
+
+    Returns:
+        VTT formatted caption text
+    """
+    cues = ["WEBVTT\nKind: captions\nLanguage: en\n"]
+    for i in range(int(hours * 3600 / CUE_SECONDS)):
+        start = i * CUE_SECONDS
+        words = " ".join(
+            f"<{format_timestamp(start)}><c>{WORDS[(i + j) % len(WORDS)]}</c>" for j in range(6)
+        )
+        cues.append(
+            f"{format_timestamp(start)} --> {format_timestamp(start + CUE_SECONDS)} align:start position:0%\n"
+            f"{words}\n"
+        )
+    return "\n".join(cues)
+
+
+def run_worker(vtt_path: str, materialize: bool) -> None:
+    """Parse one track and print baseline and peak RSS"""
+    from app.utils.youtube_extractor import YouTubeExtractor
+
+    baseline = peak_rss_mb()
+    with open(vtt_path, encoding="utf-8") as f:
+        vtt = f.read()
+
+    captions = YouTubeExtractor._parse_vtt_captions(vtt)
+    if materialize:
+        segments = captions.to_segments()
+        assert len(segments) == len(captions)
+
+    print(f"{len(captions)} {baseline:.1f} {peak_rss_mb():.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Caption memory benchmark")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 2, 5, 10],
+                        help="Track lengths to measure")
+    parser.add_argument("--materialize", action="store_true",
+                        help="Also convert to CaptionSegment objects, as the API response does")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        run_worker(args.worker, args.materialize)
+        return 0
+
+    print(f"{'hours':>6} {'segments':>9} {'baseline MB':>12} {'peak MB':>9} {'MB/hour':>9}")
+    for hours in args.hours:
+        with tempfile.NamedTemporaryFile("w", suffix=".vtt", encoding="utf-8", delete=False) as f:
+            f.write(build_vtt(hours))
+        command = [sys.executable, os.path.abspath(__file__), "--worker", f.name]
+        if args.materialize:
+            command.append("--materialize")
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        finally:
+            os.unlink(f.name)
+        segments, baseline, peak = output.split()
+        per_hour = (float(peak) - float(baseline)) / hours
+        print(f"{hours:>6g} {segments:>9} {float(baseline):>12.1f} {float(peak):>9.1f} {per_hour:>9.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
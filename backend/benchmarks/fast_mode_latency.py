@@ -0,0 +1,133 @@
+"""
+Fast-mode latency benchmark
+
+Sends fast-mode analysis requests to a running backend and checks the
+time to preview against the latency target. Videos the backend already
+has a result for would be served from the cache, so they are skipped and
+left out of the percentiles; use URLs the backend has not analyzed yet.
+
+Usage:
+    python benchmarks/fast_mode_latency.py URL [URL ...] [--api http://localhost:8000] [--target 15]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+
+DEFAULT_TARGET_SECONDS = float(os.getenv("FAST_MODE_SLA_SECONDS", "15"))
+
+
+def video_id_from_url(video_url: str) -> Optional[str]:
+    """
+    Extract the YouTube video ID from a URL
+
+    Args:
+        video_url: YouTube video URL
+
+    Returns:
+        Video ID or None if it cannot be determined
+    """
+    parsed = urlparse(video_url)
+    if parsed.netloc.endswith("youtu.be"):
+        return parsed.path.strip("/") or None
+    if "v" in parse_qs(parsed.query):
+        return parse_qs(parsed.query)["v"][0]
+    parts = parsed.path.strip("/").split("/")
+    if len(parts) == 2 and parts[0] in ("shorts", "embed", "live"):
+        return parts[1]
+    return None
+
+
+def is_cached(api_url: str, video_id: str) -> bool:
+    """
+    Check whether a fast-mode request for a video would be a cache hit
+
+    Args:
+        api_url: Backend base URL
+        video_id: YouTube video ID
+
+    Returns:
+        True if the backend already holds a successful result for the video
+    """
+    response = requests.get(f"{api_url}/api/analysis/{video_id}", timeout=10)
+    return response.status_code == 200 and response.json().get("success", False)
+
+
+def measure(api_url: str, video_url: str) -> float:
+    """
+    Time a single fast-mode request
+
+    Args:
+        api_url: Backend base URL
+        video_url: YouTube video URL
+
+    Returns:
+        Seconds until the preview response arrived
+    """
+    start = time.perf_counter()
+    response = requests.post(
+        f"{api_url}/api/analyze",
+        json={"url": video_url, "fast_mode": True},
+        timeout=120,
+    )
+    elapsed = time.perf_counter() - start
+
+    response.raise_for_status()
+    body = response.json()
+    if not body.get("is_preview"):
+        raise RuntimeError(f"Expected a preview for {video_url}, got a final result")
+
+    print(f"{elapsed:7.2f}s  preview  {video_url}")
+    return elapsed
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fast-mode latency benchmark")
+    parser.add_argument("urls", nargs="+", help="YouTube video URLs (use long videos)")
+    parser.add_argument("--api", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_SECONDS,
+                        help="p95 latency target in seconds")
+    args = parser.parse_args()
+    api_url = args.api.rstrip("/")
+
+    samples = []
+    for url in args.urls:
+        video_id = video_id_from_url(url)
+        if video_id is None:
+            print(f"{'':8s}  skipped  {url} (cannot determine video ID)")
+            continue
+        if is_cached(api_url, video_id):
+            print(f"{'':8s}  skipped  {url} (already cached)")
+            continue
+        samples.append(measure(api_url, url))
+
+    if not samples:
+        print("\nFAIL: no uncached videos to measure")
+        return 1
+
+    p50 = statistics.median(samples)
+    p95 = percentile(samples, 95)
+    print(f"\n{len(samples)} previews  p50: {p50:.2f}s  p95: {p95:.2f}s  target: {args.target:.2f}s")
+
+    if p95 > args.target:
+        print("FAIL: fast-mode p95 latency exceeds target")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
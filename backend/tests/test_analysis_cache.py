@@ -0,0 +1,113 @@
+"""
+Tests for the analysis result cache
+"""
+import threading
+
+from app.models import VideoAnalysisResponse
+from app.services.analysis_cache import AnalysisCache
+from app.services.concurrency import PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from app.utils.youtube_extractor import YouTubeExtractor
+
+
+def _preview(summary="gist", success=True):
+    return VideoAnalysisResponse(
+        success=success, message="preview", video_id="vid", is_preview=True, summary=summary
+    )
+
+
+def _final(success=True):
+    return VideoAnalysisResponse(
+        success=success, message="final", video_id="vid", is_preview=False, summary="full"
+    )
+
+
+def test_preview_never_replaces_successful_final():
+    cache = AnalysisCache()
+    cache.put("vid", _final())
+    cache.put("vid", _preview())
+
+    cached = cache.get("vid")
+    assert not cached.is_preview
+    assert cached.summary == "full"
+
+
+def test_preview_replaces_failed_final():
+    cache = AnalysisCache()
+    cache.put("vid", _final(success=False))
+    cache.put("vid", _preview())
+
+    assert cache.get("vid").is_preview
+
+
+def test_final_replaces_preview_and_attaches_captions():
+    cache = AnalysisCache()
+    captions = YouTubeExtractor._parse_vtt_captions(
+        "WEBVTT\n\n00:00.000 --> 00:01.000\nhello\n\n00:02.000 --> 00:03.000\nworld\n"
+    )
+    cache.put("vid", _preview())
+    cache.put("vid", _final(), captions)
+
+    cached = cache.get("vid")
+    assert not cached.is_preview
+    assert [seg.text for seg in cached.captions] == ["hello", "world"]
+
+
+def test_fail_preview_keeps_summary():
+    cache = AnalysisCache()
+    cache.put("vid", _preview(summary="gist"))
+    cache.fail_preview("vid", "failed")
+
+    cached = cache.get("vid")
+    assert not cached.is_preview
+    assert not cached.success
+    assert cached.summary == "gist"
+    assert cached.message == "failed"
+
+
+def test_fail_preview_leaves_final_untouched():
+    cache = AnalysisCache()
+    cache.put("vid", _final())
+    cache.fail_preview("vid", "failed")
+
+    assert cache.get("vid").success
+
+
+def test_lru_eviction():
+    cache = AnalysisCache(max_entries=1)
+    cache.put("a", _final())
+    cache.put("b", _final())
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_start_run_is_exclusive_until_finished():
+    cache = AnalysisCache()
+    assert cache.start_run("vid")
+    assert not cache.start_run("vid")
+
+    cache.finish_run("vid")
+    assert cache.start_run("vid")
+
+
+def test_wait_for_run_times_out_and_wakes_on_finish():
+    cache = AnalysisCache()
+    assert cache.wait_for_run("vid", timeout=0)
+
+    cache.start_run("vid")
+    assert not cache.wait_for_run("vid", timeout=0.05)
+
+    threading.Timer(0.05, cache.finish_run, args=("vid",)).start()
+    assert cache.wait_for_run("vid", timeout=2)
+
+
+def test_interactive_waiter_promotes_batch_run():
+    cache = AnalysisCache()
+    cache.start_run("vid", PRIORITY_BATCH)
+    assert cache.run_priority("vid", PRIORITY_INTERACTIVE) == PRIORITY_BATCH
+
+    cache.wait_for_run("vid", timeout=0, priority=PRIORITY_INTERACTIVE)
+    assert cache.run_priority("vid", PRIORITY_BATCH) == PRIORITY_INTERACTIVE
+
+    cache.finish_run("vid")
+    assert cache.run_priority("vid", PRIORITY_BATCH) == PRIORITY_BATCH
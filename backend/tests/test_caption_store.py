@@ -0,0 +1,119 @@
+"""
+Tests for VTT parsing and the compact caption store
+"""
+import pytest
+
+from app.utils.caption_store import CaptionStore
+from app.utils.youtube_extractor import YouTubeExtractor
+
+
+def _parse(vtt):
+    return [
+        (seg.timestamp, seg.text, seg.duration)
+        for seg in YouTubeExtractor._parse_vtt_captions(vtt).to_segments()
+    ]
+
+
+# Expected segments are the output of the original list-based parser
+@pytest.mark.parametrize(
+    "vtt, expected",
+    [
+        pytest.param(
+            "WEBVTT\r\n\r\n00:00:01.000 --> 00:00:02.000\r\nhello\r\nthere\r\n\r\n"
+            "00:00:03.500 --> 00:00:04.000\r\nworld\r\n",
+            [(1.0, "hello there", 1.0), (3.5, "world", 1.0)],
+            id="crlf",
+        ),
+        pytest.param(
+            "WEBVTT\n\n00:01.000 --> 00:02.000\nfirst\n\nstray text\n\n"
+            "00:03.000 --> 00:04.000\nsecond\n",
+            [(1.0, "first", 1.0), (3.0, "second", 1.0)],
+            id="stray-text-after-blank-line",
+        ),
+        pytest.param(
+            "WEBVTT\n\n00:01.000 --> 00:02.000\nfirst\n00:03.000 --> 00:04.000\nsecond\n",
+            [(1.0, "first", 1.0), (3.0, "second", 1.0)],
+            id="no-blank-line-between-cues",
+        ),
+        pytest.param(
+            "WEBVTT\n\n00:01.000 --> 00:02.000\n\n00:03.000 --> 00:04.000\n<c> </c>\n\n"
+            "00:05.000 --> 00:06.000\nthird\n",
+            [(5.0, "third", 1.0)],
+            id="empty-cues",
+        ),
+        pytest.param(
+            "WEBVTT\nKind: captions\n\n01:00:00.000 --> 01:00:02.000 align:start position:0%\n"
+            "<00:00:00.500><c> so</c><00:00:01.000><c> today</c>\n\n",
+            [(3600.0, "so today", 1.0)],
+            id="auto-caption-tags",
+        ),
+        pytest.param("WEBVTT\n", [], id="no-cues"),
+    ],
+)
+def test_parser_matches_original_output(vtt, expected):
+    assert _parse(vtt) == expected
+
+
+@pytest.fixture
+def store():
+    return CaptionStore.from_parts(
+        [0.0, 10.0, 20.0, 30.0],
+        ["alpha", "bravo", "charlie", "delta"],
+        [1.0, 2.0, 3.0, 4.0],
+    )
+
+
+def test_full_text_and_segments(store):
+    assert len(store) == 4
+    assert store.text() == "alpha bravo charlie delta"
+    assert [(seg.timestamp, seg.text, seg.duration) for seg in store.to_segments()] == [
+        (0.0, "alpha", 1.0),
+        (10.0, "bravo", 2.0),
+        (20.0, "charlie", 3.0),
+        (30.0, "delta", 4.0),
+    ]
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (0.0, 10.0, "alpha"),
+        (10.0, 30.0, "bravo charlie"),
+        (10.0, 30.000001, "bravo charlie delta"),
+        (5.0, 25.0, "bravo charlie"),
+        (20.0, None, "charlie delta"),
+        (None, 20.0, "alpha bravo"),
+        (30.0, 40.0, "delta"),
+        (11.0, 19.0, ""),
+        (20.0, 20.0, ""),
+        (40.0, None, ""),
+        (30.0, 10.0, ""),
+    ],
+)
+def test_text_range_is_start_inclusive_end_exclusive(store, start, end, expected):
+    assert store.text(start, end) == expected
+
+
+def test_text_truncation(store):
+    assert store.text(max_chars=8) == "alpha br..."
+    assert store.text(max_chars=25) == "alpha bravo charlie delta"
+    assert store.text(10.0, 30.0, max_chars=5) == "bravo..."
+    assert store.text(10.0, 20.0, max_chars=5) == "bravo"
+
+
+def test_last_timestamp(store):
+    assert store.last_timestamp == 30.0
+    assert CaptionStore().last_timestamp == 0.0
+
+
+def test_empty_store():
+    store = CaptionStore()
+    assert not store
+    assert len(store) == 0
+    assert store.text() == ""
+    assert store.to_segments() == []
+
+
+def test_from_parts_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        CaptionStore.from_parts([0.0, 1.0], ["only one"], [1.0, 1.0])
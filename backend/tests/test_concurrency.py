@@ -0,0 +1,135 @@
+"""
+Tests for the adaptive concurrency limiter
+"""
+import threading
+import time
+
+from app.services.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+)
+
+
+def _wait_for_queue(limiter: AdaptiveConcurrencyLimiter, depth: int) -> None:
+    deadline = time.monotonic() + 2
+    while limiter.snapshot()["queue_depth"] < depth:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.01)
+
+
+def test_interactive_admitted_before_batch():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    assert limiter.acquire(PRIORITY_BATCH)
+
+    order = []
+
+    def worker(priority):
+        assert limiter.acquire(priority, timeout=2)
+        order.append(priority)
+        limiter.release(ttft=0.1, tokens_per_sec=30)
+
+    batch = threading.Thread(target=worker, args=(PRIORITY_BATCH,))
+    batch.start()
+    _wait_for_queue(limiter, 1)
+    interactive = threading.Thread(target=worker, args=(PRIORITY_INTERACTIVE,))
+    interactive.start()
+    _wait_for_queue(limiter, 2)
+
+    limiter.release(ttft=0.1, tokens_per_sec=30)
+    batch.join()
+    interactive.join()
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BATCH]
+
+
+def test_batch_waiter_woken_when_interactive_leaves_queue():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=2)
+    assert limiter.acquire(PRIORITY_BATCH)
+
+    results = {}
+
+    def worker(priority):
+        start = time.monotonic()
+        results[priority] = (limiter.acquire(priority, timeout=2), time.monotonic() - start)
+
+    batch = threading.Thread(target=worker, args=(PRIORITY_BATCH,))
+    batch.start()
+    _wait_for_queue(limiter, 1)
+    interactive = threading.Thread(target=worker, args=(PRIORITY_INTERACTIVE,))
+    interactive.start()
+    _wait_for_queue(limiter, 2)
+
+    # Saturated release with a healthy sample raises the limit to 2,
+    # leaving room for both waiters
+    limiter.release(ttft=0.1, tokens_per_sec=30)
+    batch.join()
+    interactive.join()
+
+    assert limiter.limit == 2
+    assert results[PRIORITY_INTERACTIVE][0]
+    acquired, waited = results[PRIORITY_BATCH]
+    assert acquired
+    assert waited < 1
+
+
+def test_failure_shrinks_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+    assert limiter.acquire()
+    limiter.release(success=False)
+
+    assert limiter.limit == 3
+    assert limiter.snapshot()["failed"] == 1
+
+
+def test_cancelled_request_does_not_shrink_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+    assert limiter.acquire()
+    limiter.release(success=False, cancelled=True)
+
+    snapshot = limiter.snapshot()
+    assert limiter.limit == 4
+    assert snapshot["in_flight"] == 0
+    assert snapshot["cancelled"] == 1
+    assert snapshot["failed"] == 0
+
+
+def _idle_ttft(prompt_tokens: int) -> float:
+    """Time to first token on an idle backend: fixed overhead plus prefill"""
+    return 0.05 + 0.0005 * prompt_tokens
+
+
+def _run_saturated_round(limiter: AdaptiveConcurrencyLimiter, samples) -> None:
+    """Fill every slot, then release them with the given (ttft, prompt_tokens) samples"""
+    slots = limiter.limit
+    for _ in range(slots):
+        assert limiter.acquire(timeout=0)
+    for i in range(slots):
+        ttft, prompt_tokens = samples[i % len(samples)]
+        limiter.release(ttft=ttft, tokens_per_sec=30, prompt_tokens=prompt_tokens)
+
+
+def test_mixed_prompt_sizes_on_idle_backend_do_not_shrink_limit():
+    # Segment, preview, key-points and summary sized prompts
+    prompt_sizes = [600, 1150, 1700, 2200]
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=4)
+
+    limits = []
+    for round_number in range(20):
+        size = prompt_sizes[round_number % len(prompt_sizes)]
+        _run_saturated_round(limiter, [(_idle_ttft(size), size)])
+        limits.append(limiter.limit)
+
+    assert limits == sorted(limits)
+    assert limiter.limit == 4
+
+
+def test_slow_ttft_for_same_prompt_size_shrinks_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+    _run_saturated_round(limiter, [(_idle_ttft(2000), 2000)])
+    assert limiter.limit == 4
+
+    assert limiter.acquire()
+    limiter.release(ttft=_idle_ttft(2000) * 3, tokens_per_sec=30, prompt_tokens=2000)
+
+    assert limiter.limit == 3
@@ -0,0 +1,164 @@
+"""
+Tests for fast-mode handling in the analyze endpoint
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+import app.main as main
+from app.models import VideoRequest
+from app.services.analysis_cache import AnalysisCache
+from app.services.concurrency import PRIORITY_BATCH
+from app.utils.youtube_extractor import YouTubeExtractor
+
+URL = "https://www.youtube.com/watch?v=vid"
+
+VTT = "WEBVTT\n\n" + "".join(
+    f"00:{i // 60:02d}:{i % 60:02d}.000 --> 00:{i // 60:02d}:{i % 60:02d}.900\nline {i}\n\n"
+    for i in range(0, 3000, 7)
+)
+
+SEGMENT_RESPONSE = "Summary: a segment\nInsights:\n- first insight\n1. key point"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Stub out YouTube and LM Studio; record the priority of every LLM call"""
+    state = SimpleNamespace(calls=[], batch_response=SEGMENT_RESPONSE)
+
+    def send_request(prompt, priority="interactive", max_tokens=1000, timeout=None):
+        state.calls.append(priority)
+        if priority == PRIORITY_BATCH:
+            if isinstance(state.batch_response, Exception):
+                raise state.batch_response
+            return state.batch_response
+        return SEGMENT_RESPONSE
+
+    monkeypatch.setattr(main, "analysis_cache", AnalysisCache())
+    monkeypatch.setattr(main.extractor, "extract_video_info", lambda url: {
+        "title": "Title", "description": "Description", "duration": 3000, "video_id": "vid",
+    })
+    monkeypatch.setattr(
+        main.extractor, "extract_captions", lambda url: YouTubeExtractor._parse_vtt_captions(VTT)
+    )
+    monkeypatch.setattr(main.ai_analyzer, "is_available", lambda: True)
+    monkeypatch.setattr(main.ai_analyzer, "_send_request", send_request)
+
+    return state
+
+
+def _fast_request():
+    background_tasks = BackgroundTasks()
+    response = main.analyze_video(VideoRequest(url=URL, fast_mode=True), background_tasks)
+    return response, background_tasks
+
+
+def _run(background_tasks):
+    asyncio.run(background_tasks())
+
+
+def test_fast_mode_returns_preview_then_final(llm):
+    preview, background_tasks = _fast_request()
+
+    assert preview.is_preview
+    assert preview.success
+    assert preview.captions is None
+    assert main.get_analysis("vid").is_preview
+
+    _run(background_tasks)
+
+    final = main.get_analysis("vid")
+    assert not final.is_preview
+    assert final.success
+    assert final.summary
+    assert len(final.captions) == preview.total_segments
+
+
+def test_failed_background_run_keeps_preview_summary(llm):
+    llm.batch_response = None
+    preview, background_tasks = _fast_request()
+    _run(background_tasks)
+
+    cached = main.get_analysis("vid")
+    assert not cached.is_preview
+    assert not cached.success
+    assert cached.summary == preview.summary
+    assert cached.message == main.FULL_ANALYSIS_FAILED_MESSAGE
+
+
+def test_raising_background_run_keeps_preview_summary(llm):
+    llm.batch_response = RuntimeError("boom")
+    preview, background_tasks = _fast_request()
+    _run(background_tasks)
+
+    cached = main.get_analysis("vid")
+    assert not cached.is_preview
+    assert not cached.success
+    assert cached.summary == preview.summary
+    assert main.analysis_cache.start_run("vid")
+
+
+def test_second_fast_request_does_not_schedule_second_run(llm):
+    _, first_tasks = _fast_request()
+    second, second_tasks = _fast_request()
+
+    assert len(first_tasks.tasks) == 1
+    assert len(second_tasks.tasks) == 0
+    assert second.is_preview
+
+
+def test_second_fast_request_after_empty_preview_does_not_schedule_second_run(llm, monkeypatch):
+    monkeypatch.setattr(main.ai_analyzer, "generate_preview_summary", lambda *args, **kwargs: None)
+    monkeypatch.setattr(main.extractor, "extract_video_info", lambda url: {
+        "title": "Title", "description": "", "duration": 3000, "video_id": "vid",
+    })
+    first, first_tasks = _fast_request()
+    second, second_tasks = _fast_request()
+
+    assert not first.success
+    assert not second.success
+    assert len(first_tasks.tasks) == 1
+    assert len(second_tasks.tasks) == 0
+
+
+def test_normal_request_during_run_does_not_start_its_own(llm, monkeypatch):
+    monkeypatch.setattr(main, "ANALYSIS_WAIT_SECONDS", 0.05)
+    _, background_tasks = _fast_request()
+    calls_before = len(llm.calls)
+
+    # The background run is claimed but has not made progress
+    response = main.analyze_video(VideoRequest(url=URL), BackgroundTasks())
+
+    assert response.is_preview
+    assert len(llm.calls) == calls_before
+
+
+def test_normal_request_without_cached_result_gets_503_while_run_in_progress(llm, monkeypatch):
+    monkeypatch.setattr(main, "ANALYSIS_WAIT_SECONDS", 0.05)
+    main.analysis_cache.start_run("vid", PRIORITY_BATCH)
+
+    with pytest.raises(HTTPException) as error:
+        main.analyze_video(VideoRequest(url=URL), BackgroundTasks())
+
+    assert error.value.status_code == 503
+    assert llm.calls == []
+
+
+def test_normal_request_promotes_and_reuses_background_run(llm, monkeypatch):
+    _, background_tasks = _fast_request()
+
+    def join_mid_run(prompt, priority="interactive", max_tokens=1000, timeout=None):
+        llm.calls.append(priority)
+        return SEGMENT_RESPONSE
+
+    # Simulate an interactive caller joining before the background run starts
+    main.analysis_cache.wait_for_run("vid", timeout=0, priority="interactive")
+    monkeypatch.setattr(main.ai_analyzer, "_send_request", join_mid_run)
+    calls_before = len(llm.calls)
+    _run(background_tasks)
+
+    assert PRIORITY_BATCH not in llm.calls[calls_before:]
+    response = main.analyze_video(VideoRequest(url=URL), BackgroundTasks())
+    assert not response.is_preview